@@ -41,6 +41,6 @@ setup(
         "requests~=2.32.0",
         "urllib3~=1.26.18",
     ],
-    extras_require={"secrets": [resolve_sdk_dep("secrets", "~=1.0.0.dev")]},
+    extras_require={"secrets": [resolve_sdk_dep("secrets", "~=1.0.0.dev")], "http2": ["httpx[http2]>=0.27"]},
     packages=find_namespace_packages(include=["zowe.*"]),
 )
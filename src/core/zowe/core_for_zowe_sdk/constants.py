@@ -17,4 +17,6 @@ constants = {
     "ZoweServiceName": "Zowe",
     "ZoweAccountName": "secure_config_props",
     "WIN32_CRED_MAX_STRING_LENGTH": 2560,
+    "ConnectTimeout": 5,
+    "ReadTimeout": 300,
 }
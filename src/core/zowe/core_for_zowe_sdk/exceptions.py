@@ -61,6 +61,7 @@ class RequestFailed(Exception):
 
     def __init__(self, status_code: int, request_output: str):
         super().__init__("HTTP Request has failed with status code {}. \n {}".format(status_code, request_output))
+        self.status_code = status_code
 
 
 class FileNotFound(Exception):
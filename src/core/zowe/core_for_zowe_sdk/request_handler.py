@@ -10,14 +10,43 @@ SPDX-License-Identifier: EPL-2.0
 Copyright Contributors to the Zowe Project.
 """
 
-from typing import Union
+import socket
+from typing import Optional, Union
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
 
 from .exceptions import InvalidRequestMethod, RequestFailed, UnexpectedStatus
 from .logger import Log
 
+HAS_HTTPX = True
+try:
+    import httpx
+except ImportError:
+    HAS_HTTPX = False
+
+# Connection-specific headers that are not allowed in HTTP/2
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+# Retry policy of both the pooled adapter and the HTTP/2 client
+_RETRIES = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+
+
+class _SocketOptionsAdapter(HTTPAdapter):
+    """HTTP adapter opening connections with Nagle's algorithm disabled and TCP keepalive enabled."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with the adapter socket options."""
+        kwargs["socket_options"] = _SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
 
 class RequestHandler:
     """
@@ -29,14 +58,73 @@ class RequestHandler:
         Zowe SDK session arguments
     logger_name: str
         The logger name of the modules calling request handler
+    session: Optional[requests.Session]
+        A session shared with other request handlers, which is left open when this one is deleted
+    http2: bool
+        Send the requests that are not streamed over HTTP/2 with `httpx`, so that they are
+        multiplexed on a single connection. Requires the `httpx` and `h2` packages.
+
+    Raises
+    ------
+    ImportError
+        Thrown when HTTP/2 is requested and the `httpx` package is not installed.
     """
 
-    def __init__(self, session_arguments: dict, logger_name: str = __name__):
-        self.session = requests.Session()
+    def __init__(
+        self,
+        session_arguments: dict,
+        logger_name: str = __name__,
+        session: Optional[requests.Session] = None,
+        http2: bool = False,
+    ):
+        self.__owns_session = session is None
+        self.session = RequestHandler.create_session() if session is None else session
         self.session_arguments = session_arguments
         self.__valid_methods = ["GET", "POST", "PUT", "DELETE"]
         self.__handle_ssl_warnings()
         self.__logger = Log.register_logger(logger_name)
+        self.__http2_client = None
+        if http2:
+            if not HAS_HTTPX:
+                self.__logger.error("The httpx package is required to send requests over HTTP/2")
+                raise ImportError("The httpx package is required to send requests over HTTP/2")
+            self.__http2_client = self.__create_http2_client()
+
+    def __create_http2_client(self) -> "httpx.Client":
+        """
+        Create an HTTP/2 client from the session arguments.
+
+        Returns
+        -------
+        httpx.Client
+            The new client
+        """
+        timeout = self.session_arguments.get("timeout")
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        return httpx.Client(
+            http2=True,
+            verify=self.session_arguments["verify"],
+            cert=self.session_arguments.get("cert"),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+
+    @staticmethod
+    def create_session() -> requests.Session:
+        """
+        Create a session with a pooled HTTP adapter so that connections are kept alive and reused between requests.
+
+        Returns
+        -------
+        requests.Session
+            The new session
+        """
+        session = requests.Session()
+        adapter = _SocketOptionsAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRIES)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def __handle_ssl_warnings(self):
         """Turn off warnings if the SSL verification argument if off."""
@@ -64,52 +152,118 @@ class RequestHandler:
         Union[str, bytes, dict, None]
             normalized request response in json (dictionary)
         """
-        self.__method = method
-        self.__request_arguments = request_arguments
-        self.__expected_code = expected_code
         self.__logger.debug(
-            f"Request method: {self.__method}, Request arguments: {self.__request_arguments}, Expected code: {expected_code}"
+            f"Request method: {method}, Request arguments: {request_arguments}, Expected code: {expected_code}"
         )
-        self.__validate_method()
-        self.__send_request(stream=stream)
-        self.__validate_response()
+        self.__validate_method(method)
+        response = self.__send_request(method, request_arguments, stream=stream)
+        self.__validate_response(response, expected_code)
         if stream:
-            return self.__response
-        return self.__normalize_response()
+            return response
+        return self.__normalize_response(response)
 
-    def __validate_method(self):
+    def __validate_method(self, method: str):
         """Check if the input request method for the request is supported.
 
+        Parameters
+        ----------
+        method: str
+            The request method that should be used
+
         Raises
         ------
         InvalidRequestMethod
             If the input request method is not supported
         """
-        if self.__method not in self.__valid_methods:
-            self.__logger.error(f"Invalid HTTP method input {self.__method}")
-            raise InvalidRequestMethod(self.__method)
+        if method not in self.__valid_methods:
+            self.__logger.error(f"Invalid HTTP method input {method}")
+            raise InvalidRequestMethod(method)
 
-    def __send_request(self, stream: bool = False):
+    def __send_request(self, method: str, request_arguments: dict, stream: bool = False) -> requests.Response:
         """
         Build a custom session object, prepare it with a custom request and send it.
 
         Parameters
         ----------
+        method: str
+            The request method that should be used
+        request_arguments: dict
+            The dictionary containing the required arguments for the execution of the request
         stream : bool
             Flag indicates whether it is a streaming requests.
+
+        Returns
+        -------
+        requests.Response
+            The response of the request
         """
         session = self.session
-        request_object = requests.Request(method=self.__method, **self.__request_arguments)
+        request_object = requests.Request(method=method, **request_arguments)
         prepared = session.prepare_request(request_object)
-        self.__response = session.send(prepared, stream=stream, **self.session_arguments)
+        if self.__http2_client is not None and not stream:
+            return self.__send_http2_request(prepared)
+        return session.send(prepared, stream=stream, **self.session_arguments)
+
+    def __send_http2_request(self, prepared: requests.PreparedRequest) -> requests.Response:
+        """
+        Send a prepared request over HTTP/2 and convert the answer to a requests response.
+
+        Requests are retried like on the pooled adapter, and the cookies received are stored
+        in the session so that they are sent by the following requests.
+
+        Parameters
+        ----------
+        prepared: requests.PreparedRequest
+            The request prepared by the session
+
+        Returns
+        -------
+        requests.Response
+            The response of the request
+        """
+        headers = {key: value for key, value in prepared.headers.items() if key.lower() not in _HOP_BY_HOP_HEADERS}
+        retries = _RETRIES
+        while True:
+            http2_response = self.__http2_client.request(
+                prepared.method, prepared.url, headers=headers, content=prepared.body
+            )
+            if not retries.is_retry(prepared.method, http2_response.status_code):
+                break
+            try:
+                retries = retries.increment(prepared.method, prepared.url)
+            except MaxRetryError:
+                break
+            self.__logger.debug(f"Retrying {prepared.method} {prepared.url} after status {http2_response.status_code}")
+            retries.sleep()
+        self.session.cookies.update(http2_response.cookies.jar)
+        response = requests.Response()
+        response.status_code = http2_response.status_code
+        response.reason = http2_response.reason_phrase
+        response.headers = CaseInsensitiveDict(http2_response.headers)
+        response._content = http2_response.content
+        # Decode text like requests does, which assumes ISO-8859-1 for text without a charset
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = str(http2_response.url)
+        response.request = prepared
+        return response
 
     def __del__(self):
-        """Clean up the REST session object once it is no longer needed anymore."""
-        self.session.close()
+        """Clean up the REST session object once it is no longer needed anymore, unless it is shared."""
+        if self.__owns_session:
+            self.session.close()
+        if self.__http2_client is not None:
+            self.__http2_client.close()
 
-    def __validate_response(self):
+    def __validate_response(self, response: requests.Response, expected_code: list):
         """Validate if request response is acceptable based on expected code list.
 
+        Parameters
+        ----------
+        response: requests.Response
+            The response of the request
+        expected_code: list
+            The list containing the acceptable response codes
+
         Raises
         ------
         UnexpectedStatus
@@ -118,28 +272,31 @@ class RequestHandler:
             If the HTTP/HTTPS request fails
         """
         # Automatically checks if status code is between 200 and 400
-        if self.__response.ok:
-            if self.__response.status_code not in self.__expected_code:
+        if response.ok:
+            if response.status_code not in expected_code:
                 self.__logger.error(
-                    f"The status code from z/OSMF was: {self.__expected_code}\n"
-                    f"Expected: {self.__response.status_code}\n"
-                    f"Request output: {self.__response.text}"
+                    f"The status code from z/OSMF was: {expected_code}\n"
+                    f"Expected: {response.status_code}\n"
+                    f"Request output: {response.text}"
                 )
-                raise UnexpectedStatus(self.__expected_code, self.__response.status_code, self.__response.text)
+                raise UnexpectedStatus(expected_code, response.status_code, response.text)
         else:
-            output_str = str(self.__response.request.url)
-            output_str += "\n" + str(self.__response.request.headers)
-            output_str += "\n" + str(self.__response.request.body)
-            output_str += "\n" + str(self.__response.text)
-            self.__logger.error(
-                f"HTTP Request has failed with status code {self.__response.status_code}. \n {output_str}"
-            )
-            raise RequestFailed(self.__response.status_code, output_str)
+            output_str = str(response.request.url)
+            output_str += "\n" + str(response.request.headers)
+            output_str += "\n" + str(response.request.body)
+            output_str += "\n" + str(response.text)
+            self.__logger.error(f"HTTP Request has failed with status code {response.status_code}. \n {output_str}")
+            raise RequestFailed(response.status_code, output_str)
 
-    def __normalize_response(self) -> Union[str, bytes, dict, None]:
+    def __normalize_response(self, response: requests.Response) -> Union[str, bytes, dict, None]:
         """
         Normalize the response object to a JSON format.
 
+        Parameters
+        ----------
+        response: requests.Response
+            The response of the request
+
         Returns
         -------
         Union[str, bytes, dict, None]
@@ -148,10 +305,10 @@ class RequestHandler:
             - `str` when the response is plain text
             - `dict` when the response is json
         """
-        content_type = self.__response.headers.get("Content-Type")
+        content_type = response.headers.get("Content-Type")
         if content_type == "application/octet-stream":
-            return self.__response.content
+            return response.content
         elif content_type and content_type.startswith("application/json"):
-            return None if self.__response.text == "" else self.__response.json()
+            return None if response.text == "" else response.json()
         else:
-            return self.__response.text
+            return response.text
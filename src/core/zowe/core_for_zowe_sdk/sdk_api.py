@@ -10,10 +10,13 @@ SPDX-License-Identifier: EPL-2.0
 Copyright Contributors to the Zowe Project.
 """
 
-import copy
 import urllib
+from typing import Optional
+
+import requests
 
 from . import session_constants
+from .constants import constants
 from .logger import Log
 from .request_handler import RequestHandler
 from .session import ISession, Session
@@ -33,9 +36,13 @@ class SdkApi:
         Name of the logger (same as the filename by default)
     log : bool
         Flag to disable logger
+    http2 : bool
+        Send the requests that are not streamed over HTTP/2 (requires the `httpx` and `h2` packages)
     """
 
-    def __init__(self, profile: dict, default_url: str, logger_name: str = __name__, log: bool = True):
+    def __init__(
+        self, profile: dict, default_url: str, logger_name: str = __name__, log: bool = True, http2: bool = False
+    ):
         session = Session(profile)
         self.session: ISession = session.load()
 
@@ -58,9 +65,8 @@ class SdkApi:
         }
         self.__session_arguments = {
             "verify": self.session.reject_unauthorized,
-            "timeout": 30,
+            "timeout": (constants["ConnectTimeout"], constants["ReadTimeout"]),
         }
-        self.request_handler = RequestHandler(self.__session_arguments, logger_name=logger_name)
 
         if self.session.type == session_constants.AUTH_TYPE_BASIC:
             self._request_arguments["auth"] = (self.session.user, self.session.password)
@@ -71,6 +77,11 @@ class SdkApi:
         elif self.session.type == session_constants.AUTH_TYPE_CERT_PEM:
             self.__session_arguments["cert"] = self.session.cert
 
+        # The session arguments are complete here, since the HTTP/2 client reads them on creation
+        self.request_handler = RequestHandler(
+            self.__session_arguments, logger_name=logger_name, session=self._get_shared_http_session(), http2=http2
+        )
+
     def __enter__(self):
         """Return the SdkApi instance."""
         return self
@@ -79,19 +90,35 @@ class SdkApi:
         """Delete the request handler before exit."""
         del self.request_handler
 
+    def _get_shared_http_session(self) -> Optional[requests.Session]:
+        """
+        Return an HTTP session to share with other API objects.
+
+        Subclasses can override it to reuse pooled connections across instances.
+
+        Returns
+        -------
+        Optional[requests.Session]
+            None, so that the request handler creates and owns its own session
+        """
+        return None
+
     def _create_custom_request_arguments(self) -> dict:
         """
         Create a copy of the default request arguments dictionary.
 
         This method is required because the way that Python handles
-        dictionary creation
+        dictionary creation. Only the headers are copied along with the
+        dictionary itself, since the other default values are immutable.
 
         Returns
         -------
         dict
-            A deepcopy of the request_arguments
+            A copy of the request_arguments with its own headers dictionary
         """
-        return copy.deepcopy(self._request_arguments)
+        custom_args = self._request_arguments.copy()
+        custom_args["headers"] = self._default_headers.copy()
+        return custom_args
 
     def _encode_uri_component(self, str_to_adjust: str) -> str:
         """
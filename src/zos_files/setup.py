@@ -34,5 +34,6 @@ setup(
         "License :: OSI Approved :: Eclipse Public License 2.0 (EPL-2.0)",
     ],
     install_requires=[resolve_sdk_dep("core", "~=" + __version__)],
+    extras_require={"async": ["aiohttp>=3.9", "aiofiles>=23.2"], "orjson": ["orjson>=3.9"]},
     packages=find_namespace_packages(include=["zowe.*"]),
 )
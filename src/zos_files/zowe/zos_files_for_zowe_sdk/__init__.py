@@ -15,3 +15,12 @@ from .datasets import DatasetOption, Datasets
 from .file_system import FileSystems
 from .files import Files
 from .uss import USSFiles
+
+
+def __getattr__(name: str):
+    """Import AsyncUSSFiles on first access, so that aiohttp is only loaded when it is used."""
+    if name == "AsyncUSSFiles":
+        from .uss_async import AsyncUSSFiles
+
+        return AsyncUSSFiles
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
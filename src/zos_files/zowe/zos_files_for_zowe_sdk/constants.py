@@ -13,6 +13,11 @@ Copyright Contributors to the Zowe Project.
 zos_file_constants = {
     "MaxAllocationQuantity": 16777215,
     "ZoweFilesDefaultEncoding": "utf-8",
+    "BatchMaxWorkers": 20,
+    "UploadChunkSize": 1048576,
+    "DownloadChunkSize": 1048576,
+    "DownloadQueueSize": 4,
+    "SessionCacheSize": 16,
 }
 from enum import Enum
 
@@ -10,23 +10,276 @@ SPDX-License-Identifier: EPL-2.0
 Copyright Contributors to the Zowe Project.
 """
 
+import codecs
+import functools
+import hashlib
+import json
+import mmap
 import os
-from typing import Optional
-
-from zowe.core_for_zowe_sdk import SdkApi
-from zowe.core_for_zowe_sdk.exceptions import FileNotFound
+import queue
+import re
+import threading
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import requests
+from zowe.core_for_zowe_sdk import RequestHandler, SdkApi
+from zowe.core_for_zowe_sdk.exceptions import FileNotFound, RequestFailed
 from zowe.zos_files_for_zowe_sdk.constants import zos_file_constants
 
 from .response import USSListResponse
 
+HAS_ORJSON = True
+try:
+    import orjson
+except ImportError:
+    HAS_ORJSON = False
+
 _ZOWE_FILES_DEFAULT_ENCODING = zos_file_constants["ZoweFilesDefaultEncoding"]
+_BATCH_MAX_WORKERS = zos_file_constants["BatchMaxWorkers"]
+_UPLOAD_CHUNK_SIZE = zos_file_constants["UploadChunkSize"]
+_DOWNLOAD_CHUNK_SIZE = zos_file_constants["DownloadChunkSize"]
+_DOWNLOAD_QUEUE_SIZE = zos_file_constants["DownloadQueueSize"]
+_SESSION_CACHE_SIZE = zos_file_constants["SessionCacheSize"]
+_URI_SAFE_RE = re.compile(r"[A-Za-z0-9_\-./]+")
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_fs_url(fs_prefix: str, path: str) -> str:
+    """
+    Build the fs endpoint URL of a USS path.
+
+    The leading slashes of the path are stripped and paths with special characters are
+    encoded segment by segment. Results are memoized for workloads that access the same
+    paths repeatedly; the cache only holds strings, so it keeps no API object alive.
+
+    Parameters
+    ----------
+    fs_prefix: str
+        The fs endpoint URL, ending with a slash
+    path: str
+        The USS path
+
+    Returns
+    -------
+    str
+        The URL of the path
+    """
+    stripped = path.lstrip("/")
+    if not _URI_SAFE_RE.fullmatch(stripped):
+        stripped = urllib.parse.quote(stripped, safe="/!~*'()")
+    return fs_prefix + stripped
+
+
+def _dumps(obj: dict) -> bytes:
+    """
+    Serialize a request body to JSON, with orjson when it is installed.
+
+    Parameters
+    ----------
+    obj: dict
+        The body to serialize
+
+    Returns
+    -------
+    bytes
+        The UTF-8 encoded JSON document
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _lookup_local_encoding(encoding: str) -> str:
+    """
+    Return the canonical name of the Python codec used for a downloaded text file.
+
+    Parameters
+    ----------
+    encoding: str
+        Python codec name (e.g. utf-8)
+
+    Returns
+    -------
+    str
+        The canonical codec name
+
+    Raises
+    ------
+    LookupError
+        Thrown when the encoding is not a Python codec, such as a z/OS code page (e.g. IBM-1047).
+    """
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        raise LookupError(
+            f"Unknown local encoding '{encoding}': downloads take a Python codec name (e.g. utf-8), "
+            "not a z/OS code page such as IBM-1047"
+        ) from None
+
+
+def _transcode(chunks: Iterable[bytes], source_encoding: str, target_encoding: str) -> Iterator[bytes]:
+    """
+    Convert chunks of text from one encoding to another.
+
+    Incremental codecs keep the multibyte sequences split across chunks intact. Bytes that are
+    invalid in the source encoding are replaced rather than aborting the conversion.
+
+    Parameters
+    ----------
+    chunks: Iterable[bytes]
+        The chunks of text encoded with the source encoding
+    source_encoding: str
+        Encoding of the received text
+    target_encoding: str
+        Encoding of the converted text
+
+    Yields
+    ------
+    bytes
+        The chunks encoded with the target encoding
+    """
+    decoder = codecs.getincrementaldecoder(source_encoding)(errors="replace")
+    encoder = codecs.getincrementalencoder(target_encoding)()
+    for chunk in chunks:
+        yield encoder.encode(decoder.decode(chunk))
+    yield encoder.encode(decoder.decode(b"", final=True), final=True)
+
+
+def _write_in_background(output_file: str, chunks: Iterable[bytes], buffering: int):
+    """
+    Write chunks to a local file from a background thread while the next ones are received.
+
+    An error raised while writing stops the download and is raised again to the caller.
+
+    Parameters
+    ----------
+    output_file: str
+        Name of the file to be saved locally
+    chunks: Iterable[bytes]
+        The chunks to write
+    buffering: int
+        Size of the file buffer in bytes
+    """
+    pending = queue.Queue(maxsize=_DOWNLOAD_QUEUE_SIZE)
+    failed = threading.Event()
+
+    def writer(f: BinaryIO):
+        try:
+            for chunk in iter(pending.get, None):
+                f.write(chunk)
+        except Exception:
+            failed.set()
+            # Keep draining the queue so that the receiving thread never blocks on it
+            while pending.get() is not None:
+                pass
+            raise
+
+    with open(output_file, "wb", buffering=buffering) as f, ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(writer, f)
+        try:
+            for chunk in chunks:
+                if failed.is_set():
+                    break
+                pending.put(chunk)
+        finally:
+            pending.put(None)
+    future.result()
+
+
+class _FileChunks:
+    """
+    Iterable over the content of an open binary file in fixed size chunks.
+
+    The file is memory mapped when possible, so chunks are views over the page cache
+    instead of copies; otherwise it is read chunk by chunk. Exposing the file size
+    through `__len__` lets requests send a `Content-Length` header instead of falling
+    back to chunked transfer encoding. Each iteration starts over from the beginning
+    of the file, so a retried request sends the whole content again.
+
+    Parameters
+    ----------
+    file: BinaryIO
+        The open binary file
+    chunk_size: int
+        Number of bytes sent at a time
+    """
+
+    def __init__(self, file: BinaryIO, chunk_size: int):
+        self.__file = file
+        self.__size = os.fstat(file.fileno()).st_size
+        self.__chunk_size = chunk_size
+        self.__chunks: Optional[Generator[bytes, None, None]] = None
+        try:
+            self.__mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and special files such as pipes cannot be mapped
+            self.__mapped = None
+
+    def __enter__(self):
+        """Return the _FileChunks instance."""
+        return self
+
+    def __exit__(self, exc_type, exception, traceback):
+        """Release the memory map on exit."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the size of the file in bytes."""
+        return self.__size
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield the content of the file chunk by chunk."""
+        if self.__chunks is not None:
+            self.__chunks.close()
+        self.__chunks = self.__iter_mapped() if self.__mapped is not None else self.__iter_file()
+        return self.__chunks
+
+    def __iter_mapped(self) -> Generator[memoryview, None, None]:
+        """Yield views over the memory mapped file, released once the consumer asks for the next one."""
+        with memoryview(self.__mapped) as view:
+            for position in range(0, len(view), self.__chunk_size):
+                chunk = view[position : position + self.__chunk_size]
+                try:
+                    yield chunk
+                finally:
+                    chunk.release()
+
+    def __iter_file(self) -> Generator[bytes, None, None]:
+        """Yield chunks read from the file."""
+        self.__file.seek(0)
+        yield from iter(lambda: self.__file.read(self.__chunk_size), b"")
+
+    def close(self):
+        """Stop the current iteration and release the memory map."""
+        if self.__chunks is not None:
+            self.__chunks.close()
+            self.__chunks = None
+        if self.__mapped is not None:
+            self.__mapped.close()
+            self.__mapped = None
 
 
 class USSFiles(SdkApi):
     """
     Class used to represent the base z/OSMF USSFiles API.
 
-    It includes all operations related to USS files.
+    It includes all operations related to USS files. Instances connecting to the same
+    host with the same credentials share one pooled HTTP session; the least recently
+    used sessions are closed once more credentials than the cache holds are in use.
 
     Parameters
     ----------
@@ -34,11 +287,70 @@ class USSFiles(SdkApi):
         The z/OSMF connection object (generated by the ZoweSDK object)
     log : bool
         Flag to disable logger
+    http2 : bool
+        Send the requests that are not streamed over HTTP/2, multiplexed on one connection
+        (requires the `httpx` and `h2` packages)
     """
 
-    def __init__(self, connection: dict, log: bool = True):
-        super().__init__(connection, "/zosmf/restfiles/", logger_name=__name__, log=log)
+    _session_cache: "OrderedDict[Tuple, requests.Session]" = OrderedDict()
+    _session_cache_lock = threading.Lock()
+
+    def __init__(self, connection: dict, log: bool = True, http2: bool = False):
+        super().__init__(connection, "/zosmf/restfiles/", logger_name=__name__, log=log, http2=http2)
         self._default_headers["Accept-Encoding"] = "gzip"
+        self._fs_base = self._request_endpoint + "fs"
+        self._fs_prefix = self._fs_base + "/"
+
+    def _get_shared_http_session(self) -> requests.Session:
+        """
+        Return the HTTP session shared by the instances connecting with the same host and credentials.
+
+        A digest of the credentials is part of the key so that cookies are never shared between
+        identities, without keeping the credentials themselves in the cache. The cache is bounded,
+        so sessions for short-lived tokens do not keep sockets open.
+
+        Returns
+        -------
+        requests.Session
+            The cached session, created on first use
+        """
+        credentials = (self.session.user, self.session.password, self.session.token_value, self.session.cert)
+        key = (self.session.host, self.session.port, hashlib.sha256(repr(credentials).encode()).hexdigest())
+        with USSFiles._session_cache_lock:
+            session = USSFiles._session_cache.get(key)
+            if session is not None:
+                USSFiles._session_cache.move_to_end(key)
+                return session
+            session = USSFiles._session_cache[key] = RequestHandler.create_session()
+            if len(USSFiles._session_cache) > _SESSION_CACHE_SIZE:
+                # Closing only drops the pooled connections, so instances still using it keep working
+                _, evicted = USSFiles._session_cache.popitem(last=False)
+                evicted.close()
+            return session
+
+    @staticmethod
+    def close_all():
+        """Close every shared HTTP session."""
+        with USSFiles._session_cache_lock:
+            for session in USSFiles._session_cache.values():
+                session.close()
+            USSFiles._session_cache.clear()
+
+    def _fs_url(self, path: str) -> str:
+        """
+        Return the fs endpoint URL of a USS path.
+
+        Parameters
+        ----------
+        path: str
+            The USS path
+
+        Returns
+        -------
+        str
+            The URL of the path, with special characters encoded
+        """
+        return _build_fs_url(self._fs_prefix, path)
 
     def list(self, path: str) -> USSListResponse:
         """
@@ -56,7 +368,7 @@ class USSFiles(SdkApi):
         """
         custom_args = self._create_custom_request_arguments()
         custom_args["params"] = {"path": path}
-        custom_args["url"] = "{}fs".format(self._request_endpoint)
+        custom_args["url"] = self._fs_base
         response_json = self.request_handler.perform_request("GET", custom_args)
         return USSListResponse(response_json)
 
@@ -77,7 +389,7 @@ class USSFiles(SdkApi):
             A JSON containing the operation results
         """
         custom_args = self._create_custom_request_arguments()
-        custom_args["url"] = "{}fs/{}".format(self._request_endpoint, filepath_name.lstrip("/"))
+        custom_args["url"] = self._fs_url(filepath_name)
         if recursive:
             custom_args["headers"]["X-IBM-Option"] = "recursive"
 
@@ -102,15 +414,23 @@ class USSFiles(SdkApi):
         dict
             A JSON containing the operation results
         """
-        data = {"type": type, "mode": mode}
+        data = {"type": type}
+        if mode is not None:
+            data["mode"] = mode
 
         custom_args = self._create_custom_request_arguments()
-        custom_args["json"] = data
-        custom_args["url"] = "{}fs/{}".format(self._request_endpoint, file_path.lstrip("/"))
+        custom_args["data"] = _dumps(data)
+        custom_args["url"] = self._fs_url(file_path)
         response_json = self.request_handler.perform_request("POST", custom_args, expected_code=[201])
         return response_json
 
-    def write(self, filepath_name: str, data: str, encoding: str = _ZOWE_FILES_DEFAULT_ENCODING) -> dict:
+    def write(
+        self,
+        filepath_name: str,
+        data: Union[str, bytes, BinaryIO],
+        encoding: str = _ZOWE_FILES_DEFAULT_ENCODING,
+        binary: bool = False,
+    ) -> dict:
         """
         Write content to an existing UNIX file.
 
@@ -118,20 +438,35 @@ class USSFiles(SdkApi):
         ----------
         filepath_name: str
             Path of the file
-        data: str
-            Contents to be written
+        data: Union[str, bytes, BinaryIO]
+            Contents to be written, either in memory or as a seekable binary file that is sent
+            without being loaded, so that it can be sent again when the request is retried
         encoding: str
             Specifies the encoding name (e.g. IBM-1047)
+        binary: bool
+            Specifies whether the contents are binary
 
         Returns
         -------
         dict
             A JSON containing the result of the operation
+
+        Raises
+        ------
+        ValueError
+            Thrown when the contents are an iterator, which cannot be sent again on retries.
         """
+        if not hasattr(data, "read") and isinstance(data, Iterator):
+            self.logger.error("The contents to write cannot be an iterator.")
+            raise ValueError("The contents to write cannot be an iterator.")
         custom_args = self._create_custom_request_arguments()
-        custom_args["url"] = "{}fs/{}".format(self._request_endpoint, filepath_name.lstrip("/"))
+        custom_args["url"] = self._fs_url(filepath_name)
         custom_args["data"] = data
-        custom_args["headers"]["Content-Type"] = "text/plain; charset={}".format(encoding)
+        if binary:
+            custom_args["headers"]["Content-Type"] = "application/octet-stream"
+            custom_args["headers"]["X-IBM-Data-Type"] = "binary"
+        else:
+            custom_args["headers"]["Content-Type"] = "text/plain; charset={}".format(encoding)
         response_json = self.request_handler.perform_request("PUT", custom_args, expected_code=[204, 201])
         return response_json
 
@@ -150,11 +485,11 @@ class USSFiles(SdkApi):
             A JSON with the contents of the specified USS file
         """
         custom_args = self._create_custom_request_arguments()
-        custom_args["url"] = "{}fs{}".format(self._request_endpoint, filepath_name)
+        custom_args["url"] = self._fs_base + filepath_name
         response_json = self.request_handler.perform_request("GET", custom_args)
         return response_json
 
-    def get_content_streamed(self, file_path: str, binary: bool = False) -> dict:
+    def get_content_streamed(self, file_path: str, binary: bool = False, raw: bool = False) -> dict:
         """
         Retrieve the contents of a given USS file streamed.
 
@@ -164,6 +499,10 @@ class USSFiles(SdkApi):
             Path of the file
         binary: bool
             Specifies whether the contents are binary
+        raw: bool
+            Request the contents without gzip compression. This saves the client
+            the decompression work at the cost of more bandwidth, which suits
+            binary files that compress poorly.
 
         Returns
         -------
@@ -171,16 +510,30 @@ class USSFiles(SdkApi):
             A JSON response with results of the operation
         """
         custom_args = self._create_custom_request_arguments()
-        custom_args["url"] = "{}fs/{}".format(self._request_endpoint, self._encode_uri_component(file_path.lstrip("/")))
+        custom_args["url"] = self._fs_url(file_path)
         if binary:
             custom_args["headers"]["X-IBM-Data-Type"] = "binary"
+        if raw:
+            custom_args["headers"]["Accept-Encoding"] = "identity"
         response = self.request_handler.perform_request("GET", custom_args, stream=True)
         return response
 
-    def download(self, file_path: str, output_file: str, binary: bool = False):
+    def download(
+        self,
+        file_path: str,
+        output_file: str,
+        binary: bool = False,
+        chunk_size: int = _DOWNLOAD_CHUNK_SIZE,
+        raw: bool = False,
+        encoding: str = _ZOWE_FILES_DEFAULT_ENCODING,
+    ):
         """
         Retrieve the contents of a USS file and saves it to a local file.
 
+        Text received in the local encoding is written as is; otherwise it is converted from
+        the charset of the response while it is received. Writes happen on a background thread
+        while the next chunks are received.
+
         Parameters
         ----------
         file_path: str
@@ -189,16 +542,39 @@ class USSFiles(SdkApi):
             Name of the file to be saved locally
         binary: bool
             Specifies whether the contents are binary
+        chunk_size: int
+            Number of bytes read from the response and buffered before writing to disk at a time
+        raw: bool
+            Request the contents without gzip compression, trading bandwidth for client CPU
+        encoding: str
+            Python codec name (e.g. utf-8) of the local file when the contents are text. Unlike the
+            `encoding` of `write` and `upload`, this is not a z/OS code page such as IBM-1047.
         """
-        response = self.get_content_streamed(file_path, binary)
-        with open(output_file, "wb" if binary else "w", encoding="utf-8") as f:
-            for chunk in response.iter_content(chunk_size=4096, decode_unicode=not binary):
-                f.write(chunk)
-
-    def upload(self, input_file: str, filepath_name: str, encoding: str = _ZOWE_FILES_DEFAULT_ENCODING):
+        local_encoding = _lookup_local_encoding(encoding)
+        response = self.get_content_streamed(file_path, binary, raw=raw)
+        try:
+            chunks = response.iter_content(chunk_size=chunk_size)
+            source_encoding = response.encoding
+            if not binary and source_encoding and codecs.lookup(source_encoding).name != local_encoding:
+                chunks = _transcode(chunks, source_encoding, encoding)
+            _write_in_background(output_file, chunks, chunk_size)
+        finally:
+            # Return the connection to the shared pool even when the download stops early
+            response.close()
+
+    def upload(
+        self,
+        input_file: str,
+        filepath_name: str,
+        encoding: str = _ZOWE_FILES_DEFAULT_ENCODING,
+        binary: bool = False,
+        chunk_size: int = _UPLOAD_CHUNK_SIZE,
+    ):
         """
         Upload contents of a given file and saves it to a file at the given USS path.
 
+        The file is memory mapped or streamed from disk, so it is never loaded in memory as a whole.
+
         Parameters
         ----------
         input_file: str
@@ -206,7 +582,11 @@ class USSFiles(SdkApi):
         filepath_name: str
             Path of the file where it will be created
         encoding: str
-            Specifies encoding schema
+            Specifies the encoding of the local file
+        binary: bool
+            Specifies whether the contents are binary
+        chunk_size: int
+            Number of bytes sent from the local file at a time
 
         Raises
         ------
@@ -214,8 +594,138 @@ class USSFiles(SdkApi):
             Thrown when specific file is not found.
         """
         if os.path.isfile(input_file):
-            with open(input_file, "r", encoding="utf-8") as in_file:
-                response_json = self.write(filepath_name, in_file.read())
+            with open(input_file, "rb") as in_file, _FileChunks(in_file, chunk_size) as data:
+                # An empty iterable would make requests fall back to chunked transfer encoding
+                response_json = self.write(filepath_name, data if len(data) else b"", encoding=encoding, binary=binary)
         else:
             self.logger.error(f"File {input_file} not found.")
             raise FileNotFound(input_file)
+
+    def _run_batch(self, func: Callable, paths: List[str], return_exceptions: bool = False) -> dict:
+        """
+        Run a per-path operation for several paths concurrently over the pooled session.
+
+        Every operation runs to completion even when some of them fail.
+
+        Parameters
+        ----------
+        func: Callable
+            Operation called with each path
+        paths: List[str]
+            Paths to process
+        return_exceptions: bool
+            Return the exception raised for a path as its result instead of raising it
+
+        Returns
+        -------
+        dict
+            The result of each operation keyed by its path
+        """
+
+        def run(path: str):
+            try:
+                return func(path)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                return exc
+
+        with ThreadPoolExecutor(max_workers=min(_BATCH_MAX_WORKERS, max(len(paths), 1))) as executor:
+            futures = [executor.submit(run, path) for path in paths]
+        return {path: future.result() for path, future in zip(paths, futures)}
+
+    def exists_batch(self, paths: List[str], return_exceptions: bool = False) -> Dict[str, bool]:
+        """
+        Check whether each of the given USS paths exists.
+
+        Only a 404 response reports a path as missing; other failures, such as
+        authentication errors, are raised.
+
+        Parameters
+        ----------
+        paths: List[str]
+            Paths of the files or directories to check
+        return_exceptions: bool
+            Map a path to the exception raised for it instead of raising the first error, which
+            discards the results of the other paths
+
+        Returns
+        -------
+        Dict[str, bool]
+            True for each path that exists, False otherwise
+        """
+
+        def exists(path: str) -> bool:
+            try:
+                self.list(path)
+            except RequestFailed as exc:
+                if exc.status_code == 404:
+                    return False
+                raise
+            return True
+
+        return self._run_batch(exists, paths, return_exceptions)
+
+    def metadata_batch(self, paths: List[str], return_exceptions: bool = False) -> Dict[str, USSListResponse]:
+        """
+        Retrieve the attributes of each of the given USS paths.
+
+        Parameters
+        ----------
+        paths: List[str]
+            Paths of the files or directories
+        return_exceptions: bool
+            Map a path to the exception raised for it instead of raising the first error, which
+            discards the results of the other paths
+
+        Returns
+        -------
+        Dict[str, USSListResponse]
+            The list response of each path
+        """
+        return self._run_batch(self.list, paths, return_exceptions)
+
+    def delete_batch(
+        self, paths: List[str], recursive: bool = False, return_exceptions: bool = False
+    ) -> Dict[str, dict]:
+        """
+        Delete several files or directories.
+
+        Every deletion is attempted even when some fail, so pass `return_exceptions=True`
+        to know which paths were deleted when an error occurs.
+
+        Parameters
+        ----------
+        paths: List[str]
+            Paths of the files or directories to be deleted
+        recursive: bool
+            If specified as True, all the files and sub-directories will be deleted.
+        return_exceptions: bool
+            Map a path to the exception raised for it instead of raising the first error, which
+            discards the results of the other paths
+
+        Returns
+        -------
+        Dict[str, dict]
+            The operation results of each path
+        """
+        return self._run_batch(lambda path: self.delete(path, recursive), paths, return_exceptions)
+
+    def get_content_batch(self, paths: List[str], return_exceptions: bool = False) -> Dict[str, dict]:
+        """
+        Retrieve the content of several files. The complete paths must be specified.
+
+        Parameters
+        ----------
+        paths: List[str]
+            Paths of the files
+        return_exceptions: bool
+            Map a path to the exception raised for it instead of raising the first error, which
+            discards the results of the other paths
+
+        Returns
+        -------
+        Dict[str, dict]
+            The contents of each file
+        """
+        return self._run_batch(self.get_content, paths, return_exceptions)
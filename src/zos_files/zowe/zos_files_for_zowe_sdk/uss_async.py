@@ -0,0 +1,407 @@
+"""Zowe Python Client SDK.
+
+This program and the accompanying materials are made available under the terms of the
+Eclipse Public License v2.0 which accompanies this distribution, and is available at
+
+https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zowe Project.
+"""
+
+import asyncio
+import codecs
+import ssl
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from requests.utils import get_encoding_from_headers
+from zowe.core_for_zowe_sdk.exceptions import RequestFailed, UnexpectedStatus
+
+from .constants import zos_file_constants
+from .response import USSListResponse
+from .uss import USSFiles, _lookup_local_encoding
+
+HAS_AIOHTTP = True
+try:
+    import aiohttp
+except ImportError:
+    HAS_AIOHTTP = False
+
+HAS_AIOFILES = True
+try:
+    import aiofiles
+except ImportError:
+    HAS_AIOFILES = False
+
+_ZOWE_FILES_DEFAULT_ENCODING = zos_file_constants["ZoweFilesDefaultEncoding"]
+_DOWNLOAD_CHUNK_SIZE = 65536
+
+
+async def _transcode(chunks: AsyncIterator[bytes], source_encoding: str, target_encoding: str) -> AsyncIterator[bytes]:
+    """
+    Convert chunks of text received asynchronously from one encoding to another.
+
+    Parameters
+    ----------
+    chunks: AsyncIterator[bytes]
+        The chunks of text encoded with the source encoding
+    source_encoding: str
+        Encoding of the received text
+    target_encoding: str
+        Encoding of the converted text
+
+    Yields
+    ------
+    bytes
+        The chunks encoded with the target encoding
+    """
+    decoder = codecs.getincrementaldecoder(source_encoding)(errors="replace")
+    encoder = codecs.getincrementalencoder(target_encoding)()
+    async for chunk in chunks:
+        yield encoder.encode(decoder.decode(chunk))
+    yield encoder.encode(decoder.decode(b"", final=True), final=True)
+
+
+class AsyncUSSFiles:
+    """
+    Class used to represent the asynchronous z/OSMF USSFiles API.
+
+    It mirrors the read and delete operations of `USSFiles` as coroutines sharing
+    one `aiohttp` session, so that many USS files can be processed concurrently.
+    The synchronous operations are not exposed; a `USSFiles` object is only used
+    to resolve the connection, headers and URLs. Requires the `aiohttp` package.
+
+    Parameters
+    ----------
+    connection: dict
+        The z/OSMF connection object (generated by the ZoweSDK object)
+    log : bool
+        Flag to disable logger
+    limit : int
+        Maximum number of simultaneous connections kept by the session
+
+    Raises
+    ------
+    ImportError
+        Thrown when the `aiohttp` package is not installed.
+    """
+
+    def __init__(self, connection: dict, log: bool = True, limit: int = 20):
+        if not HAS_AIOHTTP:
+            raise ImportError("The aiohttp package is required to use AsyncUSSFiles")
+        self.__uss = USSFiles(connection, log=log)
+        self.logger = self.__uss.logger
+        self._limit = limit
+        self._async_session: Optional["aiohttp.ClientSession"] = None
+
+    async def __aenter__(self):
+        """Return the AsyncUSSFiles instance."""
+        return self
+
+    async def __aexit__(self, exc_type, exception, traceback):
+        """Close the aiohttp session before exit."""
+        await self.close()
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+    def _get_async_session(self) -> "aiohttp.ClientSession":
+        """
+        Lazily create the aiohttp session, which must be bound to a running event loop.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            The session shared by every coroutine of this object
+        """
+        if self._async_session is None or self._async_session.closed:
+            session_arguments = self.__uss.request_handler.session_arguments
+            connector = aiohttp.TCPConnector(
+                limit=self._limit, ttl_dns_cache=300, keepalive_timeout=60, ssl=self._build_ssl(session_arguments)
+            )
+            auth = self.__uss._request_arguments.get("auth")
+            connect_timeout, read_timeout = session_arguments["timeout"]
+            self._async_session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Authorization": aiohttp.BasicAuth(*auth).encode()} if auth else None,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=read_timeout),
+            )
+        return self._async_session
+
+    @staticmethod
+    def _build_ssl(session_arguments: dict) -> Union[bool, ssl.SSLContext]:
+        """
+        Translate the requests-style verify and cert arguments to an aiohttp ssl argument.
+
+        Parameters
+        ----------
+        session_arguments: dict
+            Zowe SDK session arguments
+
+        Returns
+        -------
+        Union[bool, ssl.SSLContext]
+            Whether to verify the server certificate, or an SSL context when a client certificate is used
+        """
+        cert = session_arguments.get("cert")
+        if cert is None:
+            return session_arguments["verify"]
+        context = ssl.create_default_context()
+        if not session_arguments["verify"]:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        context.load_cert_chain(*cert)
+        return context
+
+    async def _perform_request(
+        self, method: str, request_arguments: dict, expected_code: List[int] = [200]
+    ) -> Union[str, bytes, dict, None]:
+        """
+        Execute an asynchronous request and return the normalized response.
+
+        Parameters
+        ----------
+        method: str
+            The request method that should be used
+        request_arguments: dict
+            The dictionary containing the url, headers, params, json and data of the request
+        expected_code: List[int]
+            The list containing the acceptable response codes (default is [200])
+
+        Returns
+        -------
+        Union[str, bytes, dict, None]
+            Response body as bytes, text or JSON based on its Content-Type header
+        """
+        response = await self._send(method, request_arguments, expected_code)
+        async with response:
+            content_type = response.headers.get("Content-Type")
+            if content_type == "application/octet-stream":
+                return await response.read()
+            text = await response.text()
+            if content_type and content_type.startswith("application/json"):
+                return None if text == "" else await response.json()
+            return text
+
+    async def _send(self, method: str, request_arguments: dict, expected_code: List[int]) -> "aiohttp.ClientResponse":
+        """
+        Send a request on the shared session and validate its status code.
+
+        Parameters
+        ----------
+        method: str
+            The request method that should be used
+        request_arguments: dict
+            The dictionary containing the url, headers, params, json and data of the request
+        expected_code: List[int]
+            The list containing the acceptable response codes
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The unread response, which must be released by the caller
+
+        Raises
+        ------
+        UnexpectedStatus
+            If the response status code is not in the expected code list
+        RequestFailed
+            If the HTTP/HTTPS request fails
+        """
+        request_arguments = {key: value for key, value in request_arguments.items() if key != "auth"}
+        self.logger.debug(f"Request method: {method}, Request arguments: {request_arguments}")
+        response = await self._get_async_session().request(method, **request_arguments)
+        if response.ok:
+            if response.status not in expected_code:
+                text = await response.text()
+                response.release()
+                self.logger.error(f"The status code from z/OSMF was: {response.status}\nExpected: {expected_code}")
+                raise UnexpectedStatus(expected_code, response.status, text)
+        else:
+            text = await response.text()
+            response.release()
+            output_str = f"{response.url}\n{text}"
+            self.logger.error(f"HTTP Request has failed with status code {response.status}. \n {output_str}")
+            raise RequestFailed(response.status, output_str)
+        return response
+
+    async def list(self, path: str) -> USSListResponse:
+        """
+        Retrieve a list of USS files based on a given pattern.
+
+        Parameters
+        ----------
+        path: str
+            Path to retrieve the list
+
+        Returns
+        -------
+        USSListResponse
+            A JSON with a list of file names matching the given pattern
+        """
+        custom_args = self.__uss._create_custom_request_arguments()
+        custom_args["params"] = {"path": path}
+        custom_args["url"] = self.__uss._fs_base
+        response_json = await self._perform_request("GET", custom_args)
+        return USSListResponse(response_json)
+
+    async def delete(self, filepath_name: str, recursive: bool = False) -> dict:
+        """
+        Delete a file or directory.
+
+        Parameters
+        ----------
+        filepath_name: str
+            Path of the file to be deleted
+        recursive: bool
+            If specified as True, all the files and sub-directories will be deleted.
+
+        Returns
+        -------
+        dict
+            A JSON containing the operation results
+        """
+        custom_args = self.__uss._create_custom_request_arguments()
+        custom_args["url"] = self.__uss._fs_url(filepath_name)
+        if recursive:
+            custom_args["headers"]["X-IBM-Option"] = "recursive"
+        return await self._perform_request("DELETE", custom_args, expected_code=[204])
+
+    async def get_content(self, filepath_name: str) -> dict:
+        """
+        Retrieve the content of a filename. The complete path must be specified.
+
+        Parameters
+        ----------
+        filepath_name: str
+            Path of the file
+
+        Returns
+        -------
+        dict
+            A JSON with the contents of the specified USS file
+        """
+        custom_args = self.__uss._create_custom_request_arguments()
+        custom_args["url"] = self.__uss._fs_base + filepath_name
+        return await self._perform_request("GET", custom_args)
+
+    async def get_content_streamed(self, file_path: str, binary: bool = False) -> "aiohttp.ClientResponse":
+        """
+        Retrieve the contents of a given USS file streamed.
+
+        Parameters
+        ----------
+        file_path: str
+            Path of the file
+        binary: bool
+            Specifies whether the contents are binary
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The unread response, to be released by the caller (e.g. with `async with`)
+        """
+        custom_args = self.__uss._create_custom_request_arguments()
+        custom_args["url"] = self.__uss._fs_url(file_path)
+        if binary:
+            custom_args["headers"]["X-IBM-Data-Type"] = "binary"
+        return await self._send("GET", custom_args, [200])
+
+    async def download(
+        self,
+        file_path: str,
+        output_file: str,
+        binary: bool = False,
+        use_aiofiles: bool = False,
+        encoding: str = _ZOWE_FILES_DEFAULT_ENCODING,
+    ):
+        """
+        Retrieve the contents of a USS file and saves it to a local file.
+
+        Text is converted from the charset of the response like `USSFiles.download` does.
+
+        Parameters
+        ----------
+        file_path: str
+            Path of the file to be downloaded
+        output_file: str
+            Name of the file to be saved locally
+        binary: bool
+            Specifies whether the contents are binary
+        use_aiofiles: bool
+            Write through `aiofiles` instead of file writes run in the default executor, which
+            can be slower on fast local disks
+        encoding: str
+            Python codec name (e.g. utf-8) of the local file when the contents are text, not a z/OS code page
+
+        Raises
+        ------
+        ImportError
+            Thrown when `use_aiofiles` is set and the `aiofiles` package is not installed.
+        """
+        if use_aiofiles and not HAS_AIOFILES:
+            raise ImportError("The aiofiles package is required to download with use_aiofiles")
+        local_encoding = _lookup_local_encoding(encoding)
+        response = await self.get_content_streamed(file_path, binary)
+        async with response:
+            chunks = response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE)
+            source_encoding = get_encoding_from_headers(response.headers)
+            if not binary and source_encoding and codecs.lookup(source_encoding).name != local_encoding:
+                chunks = _transcode(chunks, source_encoding, encoding)
+            if use_aiofiles:
+                async with aiofiles.open(output_file, "wb") as f:
+                    async for chunk in chunks:
+                        await f.write(chunk)
+            else:
+                # Blocking file operations run off the event loop so other downloads keep progressing
+                f = await asyncio.to_thread(open, output_file, "wb")
+                try:
+                    async for chunk in chunks:
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+
+    async def download_many(
+        self,
+        paths: List[Tuple[str, str]],
+        binary: bool = False,
+        concurrency: int = 16,
+        use_aiofiles: bool = False,
+        encoding: str = _ZOWE_FILES_DEFAULT_ENCODING,
+    ):
+        """
+        Download several USS files concurrently over the shared session.
+
+        When a download fails, the other ones are cancelled before the error is raised.
+
+        Parameters
+        ----------
+        paths: List[Tuple[str, str]]
+            Pairs of USS file path and name of the file to be saved locally
+        binary: bool
+            Specifies whether the contents are binary
+        concurrency: int
+            Maximum number of downloads in flight at the same time
+        use_aiofiles: bool
+            Write through `aiofiles` instead of blocking writes
+        encoding: str
+            Python codec name (e.g. utf-8) of the local files when the contents are text
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(file_path: str, output_file: str):
+            async with semaphore:
+                await self.download(file_path, output_file, binary=binary, use_aiofiles=use_aiofiles, encoding=encoding)
+
+        tasks = [asyncio.ensure_future(_one(file_path, output_file)) for file_path, output_file in paths]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Cancelling has no effect on finished tasks, so this only stops the pending ones after an error
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
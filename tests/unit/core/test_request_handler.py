@@ -1,10 +1,13 @@
 """Unit tests for the Zowe Python SDK Core package."""
 
 # Including necessary paths
+import importlib.util
+import socket
 import unittest
 from unittest import mock
 
 from zowe.core_for_zowe_sdk import RequestHandler, exceptions
+from zowe.core_for_zowe_sdk.request_handler import HAS_HTTPX
 
 
 class TestRequestHandlerClass(unittest.TestCase):
@@ -19,6 +22,18 @@ class TestRequestHandlerClass(unittest.TestCase):
         request_handler = RequestHandler(self.session_arguments)
         self.assertIsInstance(request_handler, RequestHandler)
 
+    def test_session_mounts_pooled_adapter(self):
+        """Created object should mount a pooled adapter with retries for both schemes."""
+        request_handler = RequestHandler(self.session_arguments)
+        for scheme in ["https://", "http://"]:
+            adapter = request_handler.session.get_adapter(scheme + "www.zowe.org")
+            self.assertEqual(adapter._pool_maxsize, 20)
+            self.assertEqual(adapter.max_retries.total, 3)
+            self.assertEqual(adapter.max_retries.status_forcelist, [502, 503, 504])
+            socket_options = adapter.poolmanager.connection_pool_kw["socket_options"]
+            self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), socket_options)
+            self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), socket_options)
+
     @mock.patch("logging.Logger.debug")
     @mock.patch("logging.Logger.error")
     @mock.patch("requests.Session.send")
@@ -36,6 +51,78 @@ class TestRequestHandlerClass(unittest.TestCase):
         mock_send_request.assert_called_once()
         self.assertTrue(mock_send_request.call_args[1]["stream"])
 
+    @unittest.skipUnless(HAS_HTTPX and importlib.util.find_spec("h2"), "httpx[http2] is not installed")
+    @mock.patch("requests.Session.send")
+    def test_perform_request_http2(self, mock_send_request):
+        """Requests that are not streamed should be sent over HTTP/2 when enabled"""
+        import httpx
+
+        mock_send_request.return_value = mock.Mock(status_code=200)
+        http2_response = httpx.Response(
+            200,
+            headers={"Content-Type": "application/json"},
+            json={"items": []},
+            request=httpx.Request("GET", "https://www.zowe.org"),
+        )
+        request_handler = RequestHandler(self.session_arguments, http2=True)
+        with mock.patch("httpx.Client.request", return_value=http2_response) as mock_http2_request:
+            response = request_handler.perform_request(
+                "GET", {"url": "https://www.zowe.org", "headers": {"X-CSRF-ZOSMF-HEADER": ""}}
+            )
+            request_handler.perform_request("GET", {"url": "https://www.zowe.org"}, stream=True)
+
+        self.assertEqual(response, {"items": []})
+        mock_http2_request.assert_called_once()
+        headers = mock_http2_request.call_args[1]["headers"]
+        self.assertIn("X-CSRF-ZOSMF-HEADER", headers)
+        self.assertNotIn("Connection", headers)
+        mock_send_request.assert_called_once()
+
+    @unittest.skipUnless(HAS_HTTPX and importlib.util.find_spec("h2"), "httpx[http2] is not installed")
+    def test_perform_request_http2_text_encoding(self):
+        """Text without a charset received over HTTP/2 should be decoded like requests does"""
+        import httpx
+
+        http2_response = httpx.Response(
+            200,
+            headers={"Content-Type": "text/plain"},
+            content="café".encode("latin-1"),
+            request=httpx.Request("GET", "https://www.zowe.org"),
+        )
+        request_handler = RequestHandler(self.session_arguments, http2=True)
+        with mock.patch("httpx.Client.request", return_value=http2_response):
+            response = request_handler.perform_request("GET", {"url": "https://www.zowe.org"})
+
+        self.assertEqual(response, "café")
+
+    @unittest.skipUnless(HAS_HTTPX and importlib.util.find_spec("h2"), "httpx[http2] is not installed")
+    def test_perform_request_http2_retries_and_cookies(self):
+        """Requests sent over HTTP/2 should be retried on gateway errors and keep the cookies received"""
+        import httpx
+
+        request = httpx.Request("GET", "https://www.zowe.org")
+        http2_responses = [
+            httpx.Response(503, request=request),
+            httpx.Response(
+                200,
+                headers={"Content-Type": "application/json", "Set-Cookie": "LtpaToken2=token; Path=/"},
+                json={},
+                request=request,
+            ),
+        ]
+        request_handler = RequestHandler(self.session_arguments, http2=True)
+        with mock.patch("httpx.Client.request", side_effect=http2_responses) as mock_http2_request:
+            request_handler.perform_request("GET", {"url": "https://www.zowe.org"})
+
+        self.assertEqual(mock_http2_request.call_count, 2)
+        self.assertEqual(request_handler.session.cookies.get("LtpaToken2"), "token")
+
+    @mock.patch("zowe.core_for_zowe_sdk.request_handler.HAS_HTTPX", False)
+    def test_http2_requires_httpx(self):
+        """Enabling HTTP/2 without httpx should raise an ImportError"""
+        with self.assertRaises(ImportError):
+            RequestHandler(self.session_arguments, http2=True)
+
     @mock.patch("logging.Logger.error")
     def test_logger_unmatched_status_code(self, mock_logger_error: mock.MagicMock):
         """Test logger with unexpected status code"""
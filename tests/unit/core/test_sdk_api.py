@@ -2,10 +2,11 @@
 
 # Including necessary paths
 import os
-from unittest import mock
+from unittest import mock, skipUnless
 
 from pyfakefs.fake_filesystem_unittest import TestCase
 from zowe.core_for_zowe_sdk import SdkApi, session_constants
+from zowe.core_for_zowe_sdk.request_handler import HAS_HTTPX
 
 
 class TestSdkApiClass(TestCase):
@@ -57,6 +58,14 @@ class TestSdkApiClass(TestCase):
             mock_logger_error.assert_called()
             self.assertIn("certificate key", mock_logger_error.call_args[0][0])
 
+    @skipUnless(HAS_HTTPX, "httpx is not installed")
+    @mock.patch("httpx.Client")
+    def test_http2_client_certificate(self, mock_http2_client):
+        """Created object should pass the client certificate to the HTTP/2 client"""
+        SdkApi(self.cert_props, self.default_url, http2=True)
+
+        self.assertEqual(mock_http2_client.call_args[1]["cert"], ("cert", "certKey"))
+
     def test_should_handle_none_auth(self):
         props = {"host": "test"}
         sdk_api = SdkApi(props, self.default_url)
@@ -94,6 +103,18 @@ class TestSdkApiClass(TestCase):
             self.token_props["tokenType"] + "=" + self.token_props["tokenValue"],
         )
 
+    def test_custom_request_arguments_are_independent(self):
+        """Custom request arguments should not share mutable state with the defaults."""
+        sdk_api = SdkApi(self.basic_props, self.default_url)
+
+        custom_args = sdk_api._create_custom_request_arguments()
+        custom_args["headers"]["X-IBM-Option"] = "recursive"
+        custom_args["url"] = "https://another-url.com/"
+
+        self.assertNotIn("X-IBM-Option", sdk_api._default_headers)
+        self.assertEqual(sdk_api._request_arguments["url"], sdk_api._request_endpoint)
+        self.assertEqual(custom_args["auth"], sdk_api._request_arguments["auth"])
+
     def test_encode_uri_component(self):
         """Test string is being adjusted to the correct URL parameter"""
 
@@ -1,9 +1,13 @@
 """Unit tests for the Zowe Python SDK z/OS Files package."""
 
+import json
+import os
 import re
+import tempfile
 from unittest import TestCase, mock
 
-from zowe.zos_files_for_zowe_sdk import Datasets, Files, exceptions
+from zowe.core_for_zowe_sdk.exceptions import RequestFailed
+from zowe.zos_files_for_zowe_sdk import Datasets, Files, USSFiles, exceptions
 
 
 class TestFilesClass(TestCase):
@@ -19,6 +23,42 @@ class TestFilesClass(TestCase):
             "rejectUnauthorized": True,
         }
 
+    def tearDown(self):
+        """Close the HTTP sessions shared by the USSFiles objects."""
+        USSFiles.close_all()
+
+    def test_shared_session(self):
+        """Test USSFiles objects with the same connection share one HTTP session"""
+        first = USSFiles(self.test_profile)
+        second = USSFiles(self.test_profile)
+        other_user = USSFiles({**self.test_profile, "user": "Other"})
+
+        self.assertIs(first.request_handler.session, second.request_handler.session)
+        self.assertIsNot(first.request_handler.session, other_user.request_handler.session)
+        for key in USSFiles._session_cache:
+            self.assertNotIn("Password", key)
+
+        shared_session = first.request_handler.session
+        with mock.patch.object(shared_session, "close") as mock_close:
+            del second
+            mock_close.assert_not_called()
+            USSFiles.close_all()
+            mock_close.assert_called_once()
+        self.assertIsNot(USSFiles(self.test_profile).request_handler.session, shared_session)
+
+    @mock.patch("zowe.zos_files_for_zowe_sdk.uss._SESSION_CACHE_SIZE", 2)
+    def test_shared_session_eviction(self):
+        """Test the least recently used shared session is closed when the cache is full"""
+        first = USSFiles({**self.test_profile, "password": "first"}).request_handler.session
+        second = USSFiles({**self.test_profile, "password": "second"}).request_handler.session
+        self.assertIs(USSFiles({**self.test_profile, "password": "first"}).request_handler.session, first)
+
+        with mock.patch.object(second, "close") as mock_close:
+            USSFiles({**self.test_profile, "password": "third"})
+            mock_close.assert_called_once()
+        self.assertEqual(len(USSFiles._session_cache), 2)
+        self.assertIs(USSFiles({**self.test_profile, "password": "first"}).request_handler.session, first)
+
     @mock.patch("requests.Session.send")
     def test_delete_uss(self, mock_send_request):
         """Test deleting a directory recursively sends a request"""
@@ -48,6 +88,65 @@ class TestFilesClass(TestCase):
         self.assertEqual(prepared_request.method, "GET")
         self.assertEqual(prepared_request.headers["X-IBM-Data-Type"], "binary")
 
+    @mock.patch("requests.Session.send")
+    def test_urls(self, mock_send_request):
+        """Test each operation targets the fs endpoint"""
+        mock_send_request.side_effect = [
+            mock.Mock(headers={"Content-Type": "application/json"}, status_code=status_code)
+            for status_code in [204, 200, 201]
+        ]
+
+        uss = USSFiles(self.test_profile)
+        uss.delete("/u/user/file")
+        uss.get_content_streamed("/u/user/file")
+        uss.create("/u/user/dir", "dir")
+
+        urls = [call[0][0].url for call in mock_send_request.call_args_list]
+        self.assertEqual(
+            urls,
+            [
+                "https://mock-url.com:443/zosmf/restfiles/fs/u/user/file",
+                "https://mock-url.com:443/zosmf/restfiles/fs/u/user/file",
+                "https://mock-url.com:443/zosmf/restfiles/fs/u/user/dir",
+            ],
+        )
+
+    @mock.patch("requests.Session.send")
+    def test_create_body(self, mock_send_request):
+        """Test creating a file only sends the given attributes as JSON"""
+        mock_send_request.return_value = mock.Mock(headers={"Content-Type": "application/json"}, status_code=201)
+
+        uss = USSFiles(self.test_profile)
+        uss.create("/u/user/file", "file")
+        with mock.patch("zowe.zos_files_for_zowe_sdk.uss.HAS_ORJSON", False):
+            uss.create("/u/user/dir", "dir", mode="rwxr-xr-x")
+
+        first, second = [call[0][0] for call in mock_send_request.call_args_list]
+        self.assertEqual(first.headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(first.body), {"type": "file"})
+        self.assertEqual(json.loads(second.body), {"type": "dir", "mode": "rwxr-xr-x"})
+
+    def test_fs_url(self):
+        """Test USS paths are only encoded when they contain special characters"""
+        uss = USSFiles(self.test_profile)
+        fs_prefix = "https://mock-url.com:443/zosmf/restfiles/fs/"
+        self.assertEqual(uss._fs_url("/u/user/my_file-1.txt"), fs_prefix + "u/user/my_file-1.txt")
+        self.assertEqual(uss._fs_url("/u/user/my file#1"), fs_prefix + "u/user/my%20file%231")
+        self.assertEqual(uss._fs_url("/u/user/file\n"), fs_prefix + "u/user/file%0A")
+
+    @mock.patch("requests.Session.send")
+    def test_get_streamed_raw(self, mock_send_request):
+        """Test streaming raw contents disables compression"""
+        mock_send_request.return_value = mock.Mock(headers={"Content-Type": "application/json"}, status_code=200)
+
+        uss = USSFiles(self.test_profile)
+        uss.get_content_streamed("/u/user/file", binary=True, raw=True)
+        uss.get_content_streamed("/u/user/file", binary=True)
+
+        first, second = [call[0][0] for call in mock_send_request.call_args_list]
+        self.assertEqual(first.headers["Accept-Encoding"], "identity")
+        self.assertEqual(second.headers["Accept-Encoding"], "gzip")
+
     @mock.patch("requests.Session.send")
     def test_write(self, mock_send_request):
         """Test list members sends request"""
@@ -58,6 +157,13 @@ class TestFilesClass(TestCase):
         prepared_request = mock_send_request.call_args[0][0]
         self.assertEqual(prepared_request.method, "PUT")
 
+    @mock.patch("requests.Session.send")
+    def test_write_iterator(self, mock_send_request):
+        """Test writing an iterator is refused since it cannot be sent again on retries"""
+        with self.assertRaises(ValueError):
+            USSFiles(self.test_profile).write("/u/user/file", (chunk for chunk in [b"a", b"b"]), binary=True)
+        mock_send_request.assert_not_called()
+
     @mock.patch("requests.Session.send")
     def test_list_uss(self, mock_send_request):
         """Test list DSN sends request"""
@@ -69,3 +175,188 @@ class TestFilesClass(TestCase):
 
         Files(self.test_profile).list_files("")
         mock_send_request.assert_called()
+
+    @mock.patch("requests.Session.send")
+    def test_delete_batch(self, mock_send_request):
+        """Test deleting several paths sends one request per path"""
+        mock_send_request.return_value = mock.Mock(headers={"Content-Type": "application/json"}, status_code=204)
+
+        paths = ["/u/user/a", "/u/user/b", "/u/user/c"]
+        result = USSFiles(self.test_profile).delete_batch(paths, recursive=True)
+        self.assertEqual(list(result), paths)
+        self.assertEqual(mock_send_request.call_count, 3)
+        urls = sorted(call[0][0].url for call in mock_send_request.call_args_list)
+        self.assertTrue(all(url.startswith("https://mock-url.com:443/zosmf/restfiles/fs/u/user/") for url in urls))
+
+    @mock.patch("zowe.zos_files_for_zowe_sdk.USSFiles.list")
+    def test_exists_batch(self, mock_list):
+        """Test checking several paths reports the missing ones"""
+
+        def list_path(path):
+            if "missing" in path:
+                raise RequestFailed(404, path)
+            return {}
+
+        mock_list.side_effect = list_path
+
+        result = USSFiles(self.test_profile).exists_batch(["/u/user/file", "/u/user/missing"])
+        self.assertEqual(result, {"/u/user/file": True, "/u/user/missing": False})
+
+    @mock.patch("zowe.zos_files_for_zowe_sdk.USSFiles.list")
+    def test_exists_batch_auth_error(self, mock_list):
+        """Test checking paths raises failures other than a missing path"""
+        mock_list.side_effect = RequestFailed(401, "Unauthorized")
+
+        with self.assertRaises(RequestFailed):
+            USSFiles(self.test_profile).exists_batch(["/u/user/file"])
+
+    @mock.patch("zowe.zos_files_for_zowe_sdk.USSFiles.delete")
+    def test_delete_batch_return_exceptions(self, mock_delete):
+        """Test deleting several paths reports the error of each failed path"""
+        error = RequestFailed(500, "/u/user/b")
+
+        def delete_path(path, recursive):
+            if path == "/u/user/b":
+                raise error
+
+        mock_delete.side_effect = delete_path
+
+        paths = ["/u/user/a", "/u/user/b", "/u/user/c"]
+        result = USSFiles(self.test_profile).delete_batch(paths, return_exceptions=True)
+        self.assertEqual(result, {"/u/user/a": None, "/u/user/b": error, "/u/user/c": None})
+        self.assertEqual(mock_delete.call_count, 3)
+
+    @mock.patch("requests.Session.send")
+    def test_upload_streams_file(self, mock_send_request):
+        """Test uploading a file streams it with a known length"""
+        sent_chunks = []
+
+        def send(prepared_request, **kwargs):
+            sent_chunks.extend(bytes(chunk) for chunk in prepared_request.body)
+            return mock.Mock(headers={"Content-Type": "application/json"}, status_code=201)
+
+        mock_send_request.side_effect = send
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "input.bin")
+            with open(input_file, "wb") as f:
+                f.write(b"x" * 10)
+            USSFiles(self.test_profile).upload(input_file, "/u/user/file", binary=True, chunk_size=4)
+
+            prepared_request = mock_send_request.call_args[0][0]
+            self.assertEqual(prepared_request.method, "PUT")
+            self.assertEqual(prepared_request.headers["Content-Length"], "10")
+            self.assertNotIn("Transfer-Encoding", prepared_request.headers)
+            self.assertEqual(prepared_request.headers["X-IBM-Data-Type"], "binary")
+            self.assertEqual(sent_chunks, [b"xxxx", b"xxxx", b"xx"])
+
+    @mock.patch("requests.Session.send")
+    def test_upload_empty_file(self, mock_send_request):
+        """Test uploading an empty file, which cannot be memory mapped"""
+        mock_send_request.return_value = mock.Mock(headers={"Content-Type": "application/json"}, status_code=201)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "empty.txt")
+            open(input_file, "wb").close()
+            USSFiles(self.test_profile).upload(input_file, "/u/user/file")
+
+            prepared_request = mock_send_request.call_args[0][0]
+            self.assertEqual(prepared_request.headers["Content-Length"], "0")
+            self.assertEqual(prepared_request.headers["Content-Type"], "text/plain; charset=utf-8")
+
+    @mock.patch("requests.Session.send")
+    def test_download_writes_bytes(self, mock_send_request):
+        """Test downloading a text file writes the received bytes"""
+        mock_response = mock.Mock(headers={"Content-Type": "text/plain"}, status_code=200, encoding="utf-8")
+        mock_response.iter_content.return_value = [b"caf\xc3\xa9", b"\n"]
+        mock_send_request.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "output.txt")
+            USSFiles(self.test_profile).download("/u/user/file", output_file)
+
+            mock_response.iter_content.assert_called_once_with(chunk_size=1048576)
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), b"caf\xc3\xa9\n")
+
+    @mock.patch("requests.Session.send")
+    def test_download_write_error(self, mock_send_request):
+        """Test an error raised while writing the local file is propagated"""
+        mock_response = mock.Mock(
+            headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"}, status_code=200, encoding="utf-8"
+        )
+        mock_response.iter_content.return_value = [b"abc", b"def"]
+        mock_send_request.return_value = mock_response
+
+        mock_file = mock.mock_open()
+        mock_file.return_value.write.side_effect = OSError("disk full")
+        with mock.patch("builtins.open", mock_file):
+            with self.assertRaises(OSError):
+                USSFiles(self.test_profile).download("/u/user/file", "output.txt")
+        mock_response.close.assert_called_once()
+
+    @mock.patch("requests.Session.send")
+    def test_download_compressed(self, mock_send_request):
+        """Test downloading a compressed response decodes it chunk by chunk"""
+        mock_response = mock.Mock(
+            headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"}, status_code=200, encoding="utf-8"
+        )
+        mock_response.iter_content.return_value = [b"abc", b"def"]
+        mock_send_request.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "output.txt")
+            USSFiles(self.test_profile).download("/u/user/file", output_file, chunk_size=4096)
+
+            mock_response.iter_content.assert_called_once_with(chunk_size=4096)
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+
+    @mock.patch("requests.Session.send")
+    def test_download_transcodes_text(self, mock_send_request):
+        """Test downloading text in another charset converts it to the local encoding"""
+        mock_response = mock.Mock(
+            headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"}, status_code=200, encoding="ISO-8859-1"
+        )
+        mock_response.iter_content.return_value = [b"caf\xe9", b"\n"]
+        mock_split_response = mock.Mock(
+            headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"}, status_code=200, encoding="utf-8"
+        )
+        mock_split_response.iter_content.return_value = [b"caf\xc3", b"\xa9"]
+        mock_send_request.side_effect = [mock_response, mock_split_response, mock_response]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            uss = USSFiles(self.test_profile)
+            output_file = os.path.join(tmp_dir, "output.txt")
+
+            uss.download("/u/user/file", output_file)
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), b"caf\xc3\xa9\n")
+
+            uss.download("/u/user/file", output_file, encoding="latin-1")
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), b"caf\xe9")
+
+            uss.download("/u/user/file", output_file, binary=True)
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read(), b"caf\xe9\n")
+
+    @mock.patch("requests.Session.send")
+    def test_download_invalid_text(self, mock_send_request):
+        """Test bytes invalid in the response charset are replaced instead of aborting the download"""
+        mock_response = mock.Mock(headers={"Content-Type": "text/plain"}, status_code=200, encoding="utf-8")
+        mock_response.iter_content.return_value = [b"ok\xff"]
+        mock_send_request.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "output.txt")
+            USSFiles(self.test_profile).download("/u/user/file", output_file, encoding="utf-16-le")
+            with open(output_file, "rb") as f:
+                self.assertEqual(f.read().decode("utf-16-le"), "ok\ufffd")
+
+    @mock.patch("requests.Session.send")
+    def test_download_zos_code_page(self, mock_send_request):
+        """Test a z/OS code page given as the local encoding is refused before sending the request"""
+        with self.assertRaisesRegex(LookupError, "Python codec name"):
+            USSFiles(self.test_profile).download("/u/user/file", "output.txt", encoding="IBM-1047")
+        mock_send_request.assert_not_called()
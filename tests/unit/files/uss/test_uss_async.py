@@ -0,0 +1,141 @@
+"""Unit tests for the Zowe Python SDK z/OS Files asynchronous USS API."""
+
+import asyncio
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, mock, skipUnless
+
+from requests.structures import CaseInsensitiveDict
+from zowe.core_for_zowe_sdk.exceptions import RequestFailed
+from zowe.zos_files_for_zowe_sdk import AsyncUSSFiles
+from zowe.zos_files_for_zowe_sdk.uss_async import HAS_AIOHTTP
+
+
+def _mock_response(status=200, headers=None, text="", chunks=()):
+    response = mock.MagicMock(status=status, ok=status < 400, headers=headers or {})
+    response.text = mock.AsyncMock(return_value=text)
+    response.json = mock.AsyncMock(return_value={"items": []})
+
+    async def iter_chunked(_):
+        for chunk in chunks:
+            yield chunk
+
+    response.content.iter_chunked = iter_chunked
+    response.__aenter__ = mock.AsyncMock(return_value=response)
+    response.__aexit__ = mock.AsyncMock(return_value=None)
+    return response
+
+
+@skipUnless(HAS_AIOHTTP, "aiohttp is not installed")
+class TestAsyncUSSFilesClass(IsolatedAsyncioTestCase):
+    """AsyncUSSFiles class unit tests."""
+
+    def setUp(self):
+        """Setup fixtures for AsyncUSSFiles class."""
+        self.test_profile = {
+            "host": "mock-url.com",
+            "user": "Username",
+            "password": "Password",
+            "port": 443,
+            "rejectUnauthorized": True,
+        }
+
+    @mock.patch("aiohttp.ClientSession.request", new_callable=mock.AsyncMock)
+    async def test_list(self, mock_request):
+        """Test listing USS files sends a GET request with the path parameter"""
+        mock_request.return_value = _mock_response(headers={"Content-Type": "application/json"}, text="{}")
+
+        async with AsyncUSSFiles(self.test_profile) as uss:
+            await uss.list("/u/user")
+
+        mock_request.assert_awaited_once()
+        self.assertEqual(mock_request.call_args[0][0], "GET")
+        self.assertEqual(mock_request.call_args[1]["params"], {"path": "/u/user"})
+        self.assertNotIn("auth", mock_request.call_args[1])
+
+    @mock.patch("aiohttp.ClientSession.request", new_callable=mock.AsyncMock)
+    async def test_delete(self, mock_request):
+        """Test deleting a directory recursively sends the recursive option"""
+        mock_request.return_value = _mock_response(status=204)
+
+        async with AsyncUSSFiles(self.test_profile) as uss:
+            await uss.delete("/u/user/dir", recursive=True)
+
+        self.assertEqual(mock_request.call_args[0][0], "DELETE")
+        self.assertEqual(mock_request.call_args[1]["headers"]["X-IBM-Option"], "recursive")
+
+    @mock.patch("aiohttp.ClientSession.request", new_callable=mock.AsyncMock)
+    async def test_download_many(self, mock_request):
+        """Test downloading several files writes each of them"""
+        mock_request.side_effect = lambda *args, **kwargs: _mock_response(chunks=[b"abc", b"def"])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [(f"/u/user/file{i}", os.path.join(tmp_dir, f"file{i}")) for i in range(3)]
+            async with AsyncUSSFiles(self.test_profile) as uss:
+                await uss.download_many(paths, binary=True, concurrency=2)
+
+            self.assertEqual(mock_request.await_count, 3)
+            for _, output_file in paths:
+                with open(output_file, "rb") as f:
+                    self.assertEqual(f.read(), b"abcdef")
+
+    def test_synchronous_operations_not_exposed(self):
+        """Test the synchronous USSFiles operations are not inherited by AsyncUSSFiles"""
+        uss = AsyncUSSFiles(self.test_profile)
+        for name in ("exists_batch", "delete_batch", "get_content_batch", "write", "create", "upload"):
+            self.assertFalse(hasattr(uss, name), name)
+
+    @mock.patch("aiohttp.ClientSession.request", new_callable=mock.AsyncMock)
+    async def test_download_transcodes_text(self, mock_request):
+        """Test downloading a text file converts it from the response charset like USSFiles does"""
+        mock_request.side_effect = [
+            _mock_response(headers=CaseInsensitiveDict({"Content-Type": "text/plain"}), chunks=[b"caf\xe9", b"\n"]),
+            _mock_response(
+                headers=CaseInsensitiveDict({"Content-Type": "text/plain; charset=utf-8"}), chunks=[b"caf\xc3", b"\xa9"]
+            ),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, "output.txt")
+            async with AsyncUSSFiles(self.test_profile) as uss:
+                await uss.download("/u/user/file", output_file)
+                with open(output_file, "rb") as f:
+                    self.assertEqual(f.read(), b"caf\xc3\xa9\n")
+
+                await uss.download("/u/user/other", output_file, encoding="latin-1")
+                with open(output_file, "rb") as f:
+                    self.assertEqual(f.read(), b"caf\xe9")
+
+    @mock.patch("zowe.zos_files_for_zowe_sdk.uss_async.HAS_AIOFILES", False)
+    @mock.patch("aiohttp.ClientSession.request", new_callable=mock.AsyncMock)
+    async def test_download_requires_aiofiles(self, mock_request):
+        """Test writing through aiofiles raises an ImportError when it is not installed"""
+        async with AsyncUSSFiles(self.test_profile) as uss:
+            with self.assertRaises(ImportError):
+                await uss.download("/u/user/file", "output.txt", use_aiofiles=True)
+        mock_request.assert_not_awaited()
+
+    @mock.patch("aiohttp.ClientSession.request", new_callable=mock.AsyncMock)
+    async def test_download_many_cancels_on_error(self, mock_request):
+        """Test a failed download cancels the other downloads before raising"""
+        cancelled = []
+
+        async def request(method, url, **kwargs):
+            if url.endswith("bad"):
+                await asyncio.sleep(0)
+                raise RequestFailed(500, url)
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+
+        mock_request.side_effect = request
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [(f"/u/user/{name}", os.path.join(tmp_dir, name)) for name in ("a", "b", "bad")]
+            async with AsyncUSSFiles(self.test_profile) as uss:
+                with self.assertRaises(RequestFailed):
+                    await uss.download_many(paths)
+
+        self.assertEqual(len(cancelled), 2)